@@ -1,4 +1,5 @@
 import asyncio
+import functools
 import aiohttp
 import json
 import os
@@ -7,13 +8,14 @@ from datetime import datetime, timedelta, date
 from yarl import URL
 
 from retry import send_http
+from .hedging import endpoint_key, send_hedged
 from .utils import httpize
 
 
 class AsyncChartMetric:
     AUTH_TOKEN_URL = 'token'
 
-    def __init__(self):
+    def __init__(self, hedge_policy=None):
         self.refresh_token = os.environ.get("CHARTMETRIC_REFRESH_TOKEN", None)
         if not self.refresh_token:
             raise EnvironmentError("Need to set CHARTMETRIC_REFRESH_TOKEN")
@@ -21,6 +23,8 @@ class AsyncChartMetric:
         self.session = aiohttp.ClientSession()
         self.token_expires_at = None
         self.__auth_token = None
+        self.token_lock = asyncio.Lock()
+        self.hedge_policy = hedge_policy
 
     def auth_token_is_valid(self):
         try:
@@ -35,7 +39,12 @@ class AsyncChartMetric:
     async def get_token(self):
         if self.auth_token_is_valid():
             return self.__auth_token
-        await self.refresh()
+        # concurrent callers wait for a single refresh instead of each
+        # sending their own token request
+        async with self.token_lock:
+            if not self.auth_token_is_valid():
+                await self.refresh()
+        return self.__auth_token
 
     async def refresh(self):
         request_data = {
@@ -61,6 +70,13 @@ class AsyncChartMetric:
         headers = headers or {}
         if headers and "content-type" not in headers:
             headers["content-type"] = "application/json"
+
+        # only idempotent requests are safe to send twice
+        wrap_attempt = None
+        if self.hedge_policy and method.upper() == "GET":
+            wrap_attempt = functools.partial(send_hedged,
+                                             self.hedge_policy,
+                                             endpoint_key(path))
         try:
 
             response = await send_http(self.session, method,
@@ -69,7 +85,8 @@ class AsyncChartMetric:
                                        headers=headers,
                                        data=data,
                                        timeout=timeout,
-                                       chunked=chunked)
+                                       chunked=chunked,
+                                       wrap_attempt=wrap_attempt)
 
         except asyncio.TimeoutError:
                 raise
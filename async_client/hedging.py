@@ -0,0 +1,119 @@
+import asyncio
+import re
+import time
+from collections import defaultdict, deque
+
+ID_SEGMENT = re.compile(r'(?<=/)\d+(?=/|$)')
+
+
+def endpoint_key(path):
+    """
+    Turns a request path into its endpoint template,
+    e.g. 'artist/123/stat/spotify?since=...' -> 'artist/{id}/stat/spotify'
+    """
+    path = path.split('?', 1)[0]
+    return ID_SEGMENT.sub('{id}', path)
+
+
+class HedgePolicy:
+    """
+    Decides when a duplicate GET should be sent.
+
+    Arguments:
+        percentile (float): Latency percentile of the endpoint after which
+            a hedge is sent
+        max_hedge_ratio (float): Max share of hedges over recent requests,
+            every request earns this many hedge tokens
+        max_hedge_burst (float): Max hedge tokens saved up, so quiet
+            periods can't be spent as one burst of hedges
+        min_samples (int): Latencies needed before an endpoint is hedged
+        window (int): Number of last latencies kept per endpoint
+    """
+
+    def __init__(self, percentile=95, max_hedge_ratio=0.1,
+                 max_hedge_burst=2, min_samples=20, window=200):
+        self.percentile = percentile
+        self.max_hedge_ratio = max_hedge_ratio
+        self.max_hedge_burst = max_hedge_burst
+        self.hedge_tokens = max_hedge_burst
+        self.min_samples = min_samples
+        self.latencies = defaultdict(lambda: deque(maxlen=window))
+        self.requests = 0
+        self.hedges = 0
+
+    def record(self, endpoint, latency):
+        self.latencies[endpoint].append(latency)
+
+    def hedge_delay(self, endpoint):
+        samples = self.latencies.get(endpoint)
+        if not samples or len(samples) < self.min_samples:
+            return None
+        ordered = sorted(samples)
+        idx = int(len(ordered) * self.percentile / 100)
+        return ordered[min(idx, len(ordered) - 1)]
+
+    def add_request(self):
+        self.requests += 1
+        self.hedge_tokens = min(self.hedge_tokens + self.max_hedge_ratio,
+                                self.max_hedge_burst)
+
+    def take_hedge(self):
+        if self.hedge_tokens < 1:
+            return False
+        self.hedge_tokens -= 1
+        self.hedges += 1
+        return True
+
+
+async def send_hedged(policy, endpoint, send):
+    """
+    Awaits a single request attempt and, if it is slower than the endpoint
+    percentile, sends one duplicate. The first successful response wins
+    and the other request is cancelled. The elapsed time of a cancelled
+    request is still recorded, as a lower bound of its latency, so that
+    hedging does not trim the tail the percentile is computed from.
+
+    Arguments:
+        policy (HedgePolicy): Latency stats and hedge budget
+        endpoint (str): Endpoint template the request belongs to
+        send (callable): Returns a new coroutine sending the request
+    """
+    started = {}
+
+    def start():
+        task = asyncio.ensure_future(send())
+        started[task] = time.monotonic()
+        return task
+
+    def record(task):
+        policy.record(endpoint, time.monotonic() - started[task])
+
+    policy.add_request()
+    pending = {start()}
+    raised_exc = None
+    try:
+        done, pending = await asyncio.wait(
+            pending, timeout=policy.hedge_delay(endpoint))
+        if not done and policy.take_hedge():
+            pending.add(start())
+        while True:
+            if not done:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED)
+            winner = None
+            # retrieve every exception, also when another task succeeded
+            for task in done:
+                if task.exception() is None:
+                    winner = winner or task
+                else:
+                    raised_exc = task.exception()
+            if winner:
+                record(winner)
+                return winner.result()
+            if not pending:
+                raise raised_exc
+            done = set()
+    finally:
+        for task in pending:
+            record(task)
+            task.cancel()
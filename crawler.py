@@ -0,0 +1,114 @@
+import asyncio
+
+PAGE_SIZE = 200
+ARTISTS_PER_SLICE = 6000
+# ids above this are rejected, ArtistIdSet takes max id / 8 bytes
+MAX_ARTIST_ID = 50000000
+
+# (query_type, min, max) slices of artist/{query_type}/list to crawl
+CRAWL_SPEC = [
+    ('sp_popularity', 50, 100),
+    ('sp_followers', 100000, 100000000),
+    ('sp_monthly_listeners', 100000, 100000000),
+    ('ycs_subscribers', 100000, 100000000),
+]
+
+
+def slice_label(query_type, min, max):
+    return f'{query_type}:{min}-{max}'
+
+
+class ArtistIdSet:
+    """
+    Bitmap of chartmetric artist ids, one bit per id
+    """
+
+    def __init__(self):
+        self.bits = bytearray()
+
+    def __contains__(self, artist_id):
+        byte, bit = divmod(artist_id, 8)
+        if byte >= len(self.bits):
+            return False
+        return bool(self.bits[byte] & (1 << bit))
+
+    def add(self, artist_id):
+        byte, bit = divmod(artist_id, 8)
+        if byte >= len(self.bits):
+            self.bits.extend(bytes(byte - len(self.bits) + 1))
+        self.bits[byte] |= 1 << bit
+
+    def __iter__(self):
+        for byte, value in enumerate(self.bits):
+            if not value:
+                continue
+            for bit in range(8):
+                if value & (1 << bit):
+                    yield byte * 8 + bit
+
+
+class ArtistsCrawler:
+    """
+    Pages every slice of the crawl spec concurrently and puts each artist
+    on the queue only once, as soon as its page arrives. None is put on
+    the queue when the crawl is over. Membership per slice is kept in a
+    separate ArtistIdSet, so the slices an artist came from can be told
+    without storing them on every duplicate.
+    """
+
+    def __init__(self, client, queue, spec=CRAWL_SPEC,
+                 artists_per_slice=ARTISTS_PER_SLICE):
+        self.client = client
+        self.queue = queue
+        self.spec = spec
+        self.artists_per_slice = artists_per_slice
+        self.seen = ArtistIdSet()
+        self.slice_members = {slice_label(*item): ArtistIdSet()
+                              for item in spec}
+
+    async def crawl(self):
+        try:
+            results = await asyncio.gather(
+                *[self.crawl_slice(*item) for item in self.spec],
+                return_exceptions=True)
+        finally:
+            await self.queue.put(None)
+        for item, result in zip(self.spec, results):
+            if isinstance(result, Exception):
+                print(f'Failed to crawl {slice_label(*item)}: {result}')
+        return [{'artist_id': artist_id,
+                 'slices': ' '.join(self.artist_slices(artist_id))}
+                for artist_id in self.seen]
+
+    async def crawl_slice(self, query_type, min, max):
+        label = slice_label(query_type, min, max)
+        for offset in range(0, self.artists_per_slice, PAGE_SIZE):
+            resp = await self.client.artists_list(min=min,
+                                                  max=max,
+                                                  query_type=query_type,
+                                                  offset=offset)
+            if not resp:
+                break
+            data = resp['obj']['data']
+            for artist in data:
+                await self.add(artist, label)
+            print(f'Took {offset} offset of {label}')
+            if len(data) < PAGE_SIZE:
+                break
+
+    async def add(self, artist, label):
+        artist_id = artist.get('chartmetric_artist_id')
+        if (not isinstance(artist_id, int) or isinstance(artist_id, bool)
+                or not 0 < artist_id <= MAX_ARTIST_ID):
+            print(f'Skipping artist with invalid id {artist_id!r} '
+                  f'from {label}')
+            return
+        self.slice_members[label].add(artist_id)
+        if artist_id in self.seen:
+            return
+        self.seen.add(artist_id)
+        await self.queue.put(artist)
+
+    def artist_slices(self, artist_id):
+        return [label for label, members in self.slice_members.items()
+                if artist_id in members]
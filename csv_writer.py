@@ -27,9 +27,15 @@ ARTIST_TRACK_FIELDS = [
     'release_dates'
 ]
 
+ARTIST_SLICE_FIELDS = [
+    'artist_id',
+    'slices'
+]
+
 rows = {
     'artists': ARTIST_FIELDS,
-    'artists_tracks': ARTIST_TRACK_FIELDS
+    'artists_tracks': ARTIST_TRACK_FIELDS,
+    'artists_slices': ARTIST_SLICE_FIELDS
 }
 
 
@@ -38,6 +44,7 @@ class CSVWriter:
     def __init__(self):
         self.file_name = 'data_table.csv'
         self.tracks_file = 'tracks.csv'
+        self.slices_file = 'artists_slices.csv'
 
     def write(self, data, data_type):
         write_rows = rows.get(data_type)
@@ -56,4 +63,5 @@ class CSVWriter:
 
     def get_file_name(self, data_type):
         return {'artists': self.file_name,
-                'artists_tracks': self.tracks_file}.get(data_type)
+                'artists_tracks': self.tracks_file,
+                'artists_slices': self.slices_file}.get(data_type)
@@ -2,10 +2,10 @@ import asyncio
 from datetime import datetime
 
 from async_client import async_client
+from async_client.hedging import HedgePolicy
+from crawler import ArtistsCrawler, PAGE_SIZE
 from csv_writer import CSVWriter
 
-ARTISTS_NEEDED = 6000
-
 
 class FanStatsCollector:
     def __init__(self, artist_id, client):
@@ -140,43 +140,67 @@ async def collect_fan_stats(artist_id, client):
     return stats
 
 
+async def collect_artist_data(artist, client, csv_writer):
+    artist_id = artist['chartmetric_artist_id']
+    fan_stats = await collect_fan_stats(artist_id, client)
+    artist.update(fan_stats)
+    tracks_helper = TracksCollector(artist_id, client)
+    tracks_list = await tracks_helper.tracks_list()
+    tracks = []
+    for track in tracks_list:
+        tmp_dict = dict(artist_id=artist_id)
+        if 'id' in track:
+            tmp_dict['track_id'] = track['id']
+        else:
+            tmp_dict['track_id'] = track['track_id']
+        tmp_dict['name'] = track['name']
+        if track['release_dates']:
+            tmp_dict['release_dates'] = ' '.join(
+                [d if d else '' for d in track['release_dates']])
+        tracks.append(tmp_dict)
+    csv_writer.write(tracks, 'artists_tracks')
+    return artist
+
+
 async def get_artists_data(client):
-    queries_count = int(ARTISTS_NEEDED / 200)
-    offset = 0
     csv_writer = CSVWriter()
-    for idx in range(queries_count):
-        artists_list = list()
-        resp = await client.artists_list(offset=offset+200*idx)
-        for artist in resp['obj']['data']:
-            artist_id = artist['chartmetric_artist_id']
-            fan_stats = await collect_fan_stats(artist_id, client)
-            artist.update(fan_stats)
-            tracks_helper = TracksCollector(artist_id, client)
-            tracks_list = await tracks_helper.tracks_list()
-            tracks = []
-            for track in tracks_list:
-                tmp_dict = dict(artist_id=artist_id)
-                if 'id' in track:
-                    tmp_dict['track_id'] = track['id']
-                else:
-                    tmp_dict['track_id'] = track['track_id']
-                tmp_dict['name'] = track['name']
-                if track['release_dates']:
-                    tmp_dict['release_dates'] = ' '.join(
-                        [d if d else '' for d in track['release_dates']])
-                tracks.append(tmp_dict)
-            csv_writer.write(tracks, 'artists_tracks')
-            artists_list.append(artist)
-
-        print(f'Took {offset+200*idx} offset')
-        csv_writer.write(artists_list, 'artists')
-    await client.close()
+    queue = asyncio.Queue()
+    crawler = ArtistsCrawler(client, queue)
+    crawl_future = asyncio.ensure_future(crawler.crawl())
+    processed = 0
+    artists_list = list()
+    try:
+        while True:
+            artist = await queue.get()
+            if artist is None:
+                break
+            artists_list.append(
+                await collect_artist_data(artist, client, csv_writer))
+            if len(artists_list) == PAGE_SIZE:
+                processed += len(artists_list)
+                print(f'Processed {processed} artists')
+                csv_writer.write(artists_list, 'artists')
+                artists_list = list()
+        if artists_list:
+            processed += len(artists_list)
+            print(f'Processed {processed} artists')
+            csv_writer.write(artists_list, 'artists')
+        artists_slices = await crawl_future
+        csv_writer.write(artists_slices, 'artists_slices')
+    finally:
+        # let the crawl finish cancelling before its session is closed
+        crawl_future.cancel()
+        try:
+            await crawl_future
+        except asyncio.CancelledError:
+            pass
+        await client.close()
 
 
 if __name__ == '__main__':
     started = datetime.now()
     try:
-        client = async_client.AsyncChartMetric()
+        client = async_client.AsyncChartMetric(hedge_policy=HedgePolicy())
         loop = asyncio.get_event_loop()
         artists_future = asyncio.ensure_future(get_artists_data(client))
         loop.run_until_complete(artists_future)
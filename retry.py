@@ -25,11 +25,44 @@ class FailedRequest(Exception):
             c=self.code, u=self.url, m=self.message, r=self.raised))
 
 
+async def send_once(session, method, url, *,
+                    http_status_codes_to_retry=HTTP_STATUS_CODES_TO_RETRY,
+                    **kwargs):
+    """
+    Sends a single HTTP request attempt.
+
+    Raises aiohttp.ClientResponseError for statuses that should be retried.
+    """
+    async with getattr(session, method)(url, **kwargs) as response:
+        print(f"sending  - > {url}")
+        if response.status == 200:
+            data = await response.json()
+            return data
+        elif response.status in http_status_codes_to_retry:
+            print('retrying')
+            raise aiohttp.ClientResponseError(
+                code=response.status,
+                message=response.reason,
+                history=response._history,
+                request_info=response._request_info)
+        else:
+            try:
+                data = await response.json()
+            except json.decoder.JSONDecodeError as exc:
+                raise FailedRequest(
+                    code=response.status, message=str(exc),
+                    raised=exc.__class__.__name__, url=url)
+            else:
+                print('received %s for %s', data, url)
+                print(data['errors'][0]['detail'])
+
+
 async def send_http(session, method, url, *,
                     retries=-1,
                     interval=60,
                     backoff=3,
                     http_status_codes_to_retry=HTTP_STATUS_CODES_TO_RETRY,
+                    wrap_attempt=None,
                     **kwargs):
     """
     Sends a HTTP request and implements a retry logic.
@@ -41,6 +74,8 @@ async def send_http(session, method, url, *,
         retries (int): Number of times to retry in case of failure
         interval (float): Time to wait before retries
         backoff (int): Multiply interval by this factor after each failure
+        wrap_attempt (callable): Awaited with a function starting a single
+            attempt, e.g. to hedge it. Backoff sleeps stay outside of it
         read_timeout (float): Time to wait for a response
     """
     backoff_interval = interval
@@ -57,6 +92,11 @@ async def send_http(session, method, url, *,
     else:  # any other value means retry N times
         attempt = retries + 1
 
+    def send():
+        return send_once(session, method, url,
+                         http_status_codes_to_retry=http_status_codes_to_retry,
+                         **kwargs)
+
     while attempt != 0:
         if raised_exc:
             print('WAITING !!!')
@@ -64,29 +104,12 @@ async def send_http(session, method, url, *,
             # bump interval for the next possible attempt
             backoff_interval = backoff_interval * backoff
         try:
-            async with getattr(session, method)(url, **kwargs) as response:
-                print(f"sending  - > {url}")
-                if response.status == 200:
-                    data = await response.json()
-                    return data
-                elif response.status in http_status_codes_to_retry:
-                    print('retrying')
-                    raise aiohttp.ClientResponseError(
-                        code=response.status,
-                        message=response.reason,
-                        history=response._history,
-                        request_info=response._request_info)
-                else:
-                    try:
-                        data = await response.json()
-                    except json.decoder.JSONDecodeError as exc:
-                        raise FailedRequest(
-                            code=response.status, message=str(exc),
-                            raised=exc.__class__.__name__, url=url)
-                    else:
-                        print('received %s for %s', data, url)
-                        print(data['errors'][0]['detail'])
-                        raised_exc = None
+            # attempts after a failure are not wrapped, so a request
+            # backing off from 429/5xx is never hedged
+            if wrap_attempt and not raised_exc:
+                data = await wrap_attempt(send)
+            else:
+                data = await send()
         except (aiohttp.ClientResponseError,
                 # aiohttp.ClientRequestError,
                 asyncio.TimeoutError) as exc:
@@ -97,8 +120,7 @@ async def send_http(session, method, url, *,
             raised_exc = FailedRequest(code=code, message=exc, url=url,
                                        raised=exc.__class__.__name__)
         else:
-            raised_exc = None
-            break
+            return data
 
         attempt -= 1
 
@@ -0,0 +1,89 @@
+import asyncio
+
+from crawler import (MAX_ARTIST_ID, PAGE_SIZE, ArtistIdSet, ArtistsCrawler,
+                     slice_label)
+
+
+class FakeClient:
+    """
+    Serves artists_list pages from {query_type: [ids]}, PAGE_SIZE per page.
+    A query_type mapped to an exception raises it instead.
+    """
+
+    def __init__(self, slices):
+        self.slices = slices
+        self.calls = []
+
+    async def artists_list(self, min, max, query_type, offset):
+        self.calls.append((query_type, offset))
+        await asyncio.sleep(0)
+        ids = self.slices[query_type]
+        if isinstance(ids, Exception):
+            raise ids
+        page = ids[offset:offset + PAGE_SIZE]
+        return {'obj': {'data': [{'chartmetric_artist_id': artist_id}
+                                 for artist_id in page]}}
+
+
+def crawl(slices):
+    spec = [(query_type, 0, 1) for query_type in slices]
+    client = FakeClient(slices)
+
+    async def main():
+        queue = asyncio.Queue()
+        crawler = ArtistsCrawler(client, queue, spec=spec)
+        artists_slices = await crawler.crawl()
+        queued = []
+        while True:
+            artist = queue.get_nowait()
+            if artist is None:
+                break
+            queued.append(artist['chartmetric_artist_id'])
+        return queued, artists_slices
+
+    queued, artists_slices = asyncio.run(main())
+    return client, queued, artists_slices
+
+
+def test_artist_id_set():
+    ids = ArtistIdSet()
+    for artist_id in [9, 1, 1000, 9]:
+        ids.add(artist_id)
+    assert 9 in ids
+    assert 2 not in ids
+    assert 10 ** 6 not in ids
+    assert list(ids) == [1, 9, 1000]
+
+
+def test_overlapping_slices_are_deduplicated():
+    _, queued, artists_slices = crawl({'a': [1, 2, 3], 'b': [3, 4]})
+    assert sorted(queued) == [1, 2, 3, 4]
+    slices = {row['artist_id']: row['slices'] for row in artists_slices}
+    assert slices == {
+        1: slice_label('a', 0, 1),
+        2: slice_label('a', 0, 1),
+        3: ' '.join([slice_label('a', 0, 1), slice_label('b', 0, 1)]),
+        4: slice_label('b', 0, 1),
+    }
+
+
+def test_short_page_ends_slice():
+    ids = list(range(1, PAGE_SIZE + 11))
+    client, queued, _ = crawl({'a': ids})
+    assert client.calls == [('a', 0), ('a', PAGE_SIZE)]
+    assert queued == ids
+
+
+def test_failing_slice_does_not_stop_others():
+    _, queued, artists_slices = crawl({'a': [1, 2],
+                                       'bad': RuntimeError('boom'),
+                                       'b': [3]})
+    # without the end marker, draining the queue raises QueueEmpty
+    assert sorted(queued) == [1, 2, 3]
+    assert [row['artist_id'] for row in artists_slices] == [1, 2, 3]
+
+
+def test_invalid_ids_are_skipped():
+    _, queued, _ = crawl({'a': [None, '5', -1, 0, True,
+                                MAX_ARTIST_ID + 1, MAX_ARTIST_ID, 7]})
+    assert queued == [MAX_ARTIST_ID, 7]
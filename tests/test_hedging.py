@@ -0,0 +1,133 @@
+import asyncio
+
+import pytest
+
+from async_client.hedging import HedgePolicy, endpoint_key, send_hedged
+
+ENDPOINT = 'artist/{id}/stat/{source}'
+
+
+def warmed_policy(latency=0.01, **kwargs):
+    kwargs.setdefault('max_hedge_ratio', 1)
+    policy = HedgePolicy(min_samples=5, **kwargs)
+    for _ in range(5):
+        policy.record(ENDPOINT, latency)
+    return policy
+
+
+class FakeSend:
+    """
+    Each call sleeps for the next delay and returns its call number.
+    A (delay, exception) pair raises the exception after the delay.
+    """
+
+    def __init__(self, *delays):
+        self.delays = list(delays)
+        self.calls = 0
+        self.cancelled = []
+
+    async def __call__(self):
+        call = self.calls
+        self.calls += 1
+        delay, exc = self.delays[call], None
+        if isinstance(delay, tuple):
+            delay, exc = delay
+        try:
+            await asyncio.sleep(delay)
+            if exc:
+                raise exc
+        except asyncio.CancelledError:
+            self.cancelled.append(call)
+            raise
+        return call
+
+
+def run(policy, send):
+    async def main():
+        result = await send_hedged(policy, ENDPOINT, send)
+        # let the cancelled loser observe its cancellation
+        await asyncio.sleep(0)
+        return result
+    return asyncio.run(main())
+
+
+def test_endpoint_key():
+    assert (endpoint_key('artist/123/stat/spotify?since=2020-01-01')
+            == 'artist/{id}/stat/spotify')
+    assert endpoint_key('track/42') == 'track/{id}'
+
+
+def test_no_hedge_below_min_samples():
+    policy = HedgePolicy(min_samples=5, max_hedge_ratio=1)
+    send = FakeSend(0.05, 0.001)
+    assert run(policy, send) == 0
+    assert send.calls == 1
+    assert policy.hedges == 0
+    assert len(policy.latencies[ENDPOINT]) == 1
+
+
+def test_hedge_fires_after_delay_and_loser_is_cancelled():
+    policy = warmed_policy()
+    send = FakeSend(1, 0.001)
+    assert run(policy, send) == 1
+    assert send.calls == 2
+    assert send.cancelled == [0]
+    assert policy.hedges == 1
+
+
+def test_fast_response_is_not_hedged():
+    policy = warmed_policy(latency=0.5)
+    send = FakeSend(0.001, 0.001)
+    assert run(policy, send) == 0
+    assert send.calls == 1
+    assert policy.hedges == 0
+
+
+def test_cancelled_loser_latency_is_recorded():
+    policy = warmed_policy()
+    send = FakeSend(1, 0.02)
+    run(policy, send)
+    latencies = list(policy.latencies[ENDPOINT])[5:]
+    # winner and a lower bound for the cancelled primary
+    assert len(latencies) == 2
+    assert max(latencies) >= 0.03
+
+
+def test_hedge_cap_is_respected():
+    policy = warmed_policy(max_hedge_ratio=0.5, max_hedge_burst=1)
+    send = FakeSend(0.05, 0.001, 0.05)
+    run(policy, send)
+    run(policy, send)
+    assert policy.requests == 2
+    assert policy.hedges == 1
+    assert send.calls == 3
+
+
+def test_quiet_period_does_not_allow_hedge_burst():
+    policy = HedgePolicy(max_hedge_ratio=0.1, max_hedge_burst=2)
+    for _ in range(1000):
+        policy.add_request()
+    # latency spike: every request wants a hedge
+    hedges = 0
+    for _ in range(100):
+        policy.add_request()
+        if policy.take_hedge():
+            hedges += 1
+    assert hedges <= 2 + 100 * 0.1
+
+
+def test_exception_falls_through_to_other_task():
+    policy = warmed_policy()
+    send = FakeSend(0.05, (0.001, ValueError('boom')))
+    assert run(policy, send) == 0
+    assert send.calls == 2
+    assert send.cancelled == []
+
+
+def test_exception_raised_when_both_fail():
+    policy = warmed_policy()
+    send = FakeSend((0.05, ValueError('first')),
+                    (0.001, ValueError('second')))
+    with pytest.raises(ValueError):
+        run(policy, send)
+    assert send.calls == 2